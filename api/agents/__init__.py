@@ -0,0 +1,3 @@
+from agents.search_agent import SearchAgent
+
+__all__ = ["SearchAgent"]
@@ -0,0 +1,120 @@
+"""FastAPI 의존성 주입"""
+from functools import lru_cache
+
+from config import Settings, settings
+
+
+def get_settings() -> Settings:
+    # settings는 모듈 전역 싱글턴(frozen) — lru_cache 래핑은 의존성 해석마다
+    # 불필요한 dict+lock 오버헤드만 더한다
+    return settings
+
+
+@lru_cache()
+def get_redis_pool():
+    """프로세스 전역 Redis 커넥션 풀 (호출마다 TCP 핸드셰이크 방지)"""
+    import redis
+    return redis.ConnectionPool.from_url(
+        settings.redis_url,
+        socket_timeout=1.5,
+        socket_connect_timeout=1.5,
+    )
+
+
+@lru_cache()
+def get_db_engine():
+    """프로세스 전역 SQLAlchemy 엔진 (커넥션 풀 재사용)"""
+    from sqlalchemy import create_engine
+    return create_engine(
+        settings.postgres_url,
+        pool_pre_ping=True,
+        pool_size=5,
+        connect_args={"connect_timeout": 2},
+    )
+
+
+@lru_cache()
+def get_milvus_alias() -> str:
+    """Milvus 연결을 1회만 맺고 alias를 재사용"""
+    from pymilvus import connections
+    connections.connect(
+        alias="default",
+        host=settings.milvus_host,
+        port=settings.milvus_port,
+        timeout=2,
+    )
+    return "default"
+
+
+@lru_cache()
+def get_http_client():
+    """공유 httpx.AsyncClient (keep-alive 커넥션 풀)"""
+    import httpx
+    return httpx.AsyncClient(timeout=2.0)
+
+
+@lru_cache()
+def get_celery_app():
+    """프로세스 전역 Celery 앱
+
+    요청마다 AsyncResult(task_id)로 앱/백엔드를 새로 묶으면 백엔드의
+    Redis 연결 준비 비용을 반복 지불한다. 앱을 1회 만들어 두면
+    backend.client 풀이 재사용된다.
+    """
+    from celery import Celery
+    return Celery(
+        broker=settings.celery_broker_url,
+        backend=settings.celery_backend_url,
+    )
+
+
+@lru_cache()
+def get_llm_service():
+    from services.llm_service import LLMService
+    return LLMService()
+
+
+@lru_cache()
+def get_cache_service():
+    from services.cache_service import CacheService
+    return CacheService()
+
+
+@lru_cache()
+def get_embedding_service():
+    from services.embedding_service import EmbeddingService
+    return EmbeddingService(cache_service=get_cache_service())
+
+
+@lru_cache()
+def get_file_service():
+    from services.file_service import FileService
+    return FileService()
+
+
+@lru_cache()
+def get_vector_store():
+    from services.vector_store import VectorStoreService
+    return VectorStoreService()
+
+
+@lru_cache()
+def get_embed_batcher():
+    """프로세스 단위 임베딩 마이크로 배처
+
+    백그라운드 드레인 태스크는 첫 embed() 호출 시 현재 이벤트 루프에
+    지연 기동되므로 여기서는 생성만 한다.
+    """
+    from services.embed_batcher import EmbedBatcher
+    return EmbedBatcher(get_llm_service())
+
+
+@lru_cache()
+def get_search_agent():
+    from agents.search_agent import SearchAgent
+    return SearchAgent(
+        llm_service=get_llm_service(),
+        vector_store=get_vector_store(),
+        cache_service=get_cache_service(),
+        embed_batcher=get_embed_batcher(),
+    )
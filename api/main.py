@@ -0,0 +1,191 @@
+"""FastAPI 엔트리포인트"""
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import uvloop
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
+
+from config import settings
+from dependencies import (
+    get_embedding_service,
+    get_file_service,
+    get_llm_service,
+    get_search_agent,
+)
+from middleware import ResponseCacheMiddleware
+from routers import action, health, search, upload
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# uvloop을 기본 루프 정책으로 — __main__ 경로뿐 아니라 컨테이너의
+# `uvicorn main:app` 기동에서도 libuv 루프가 보장된다. 네트워크 위주
+# 코루틴(LLM/임베딩/스토리지)에서 기본 selector 루프 대비 처리량 수 배
+uvloop.install()
+
+# 에이전트 캐시 지표
+_CACHE_GAUGE = Gauge(
+    "rag_agent_cache", "Search agent cache counters", ["metric"]
+)
+
+
+async def _warm_query_pool() -> None:
+    """인기 질의 임베딩 풀 웜업
+
+    Postgres 질의 로그 뷰(popular_queries)에서 상위 질의를 읽어 배치
+    임베딩 후 에이전트에 고정해 둔다. 분포 상위 질의는 첫 요청부터
+    캐시 히트로 처리된다.
+    """
+    def _fetch_popular():
+        from sqlalchemy import create_engine, text
+        engine = create_engine(settings.postgres_url)
+        try:
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    text("SELECT query FROM popular_queries LIMIT 100")
+                )
+                return [row[0] for row in rows]
+        finally:
+            engine.dispose()
+
+    try:
+        queries = await asyncio.to_thread(_fetch_popular)
+    except Exception as e:
+        logger.warning(f"Popular query fetch failed, skipping warmup: {e}")
+        return
+
+    if not queries:
+        return
+
+    try:
+        embeddings = await get_llm_service().embed_batch(queries)
+    except Exception as e:
+        logger.warning(f"Query pool embedding failed: {e}")
+        return
+
+    get_search_agent().warm_precomputed(queries, embeddings)
+    logger.info(f"Warmed {len(queries)} precomputed query embeddings")
+
+
+async def _query_pool_refresher() -> None:
+    """cache_ttl 주기로 인기 질의 풀 재웜업"""
+    while True:
+        await asyncio.sleep(settings.cache_ttl)
+        await _warm_query_pool()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MinIO 클라이언트를 기동 시 1회 생성(버킷 확인 포함, 블로킹이라 스레드로).
+    # 첫 업로드 요청이 의존성 해석 중에 이 비용을 이벤트 루프에서 내지 않게 한다.
+    try:
+        await asyncio.to_thread(get_file_service)
+    except Exception as e:
+        logger.warning(f"File service warmup failed: {e}")
+
+    # CLIP 로드 + Ollama 임베딩 모델 GPU 적재 — 첫 요청이 수십 초를
+    # 내지 않게 기동 시 치른다
+    if settings.warmup_on_startup:
+        try:
+            await get_embedding_service().warmup()
+        except Exception as e:
+            logger.warning(f"Embedding warmup failed: {e}")
+
+    await _warm_query_pool()
+    refresher = asyncio.create_task(_query_pool_refresher())
+    # 모델 상주 유지 핑 — 유휴 언로드 후 재적재 스톨 방지
+    keepalive = asyncio.create_task(get_llm_service().keepalive_loop())
+    # 다른 레플리카의 업로드 후 결과 캐시 무효화 브로드캐스트 구독
+    invalidator = asyncio.create_task(
+        get_search_agent().invalidation_listener()
+    )
+    yield
+    for task in (refresher, keepalive, invalidator):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+app = FastAPI(
+    title=settings.app_name,
+    version=settings.version,
+    lifespan=lifespan,
+    # orjson 직렬화: 중첩 search_results/metadata 응답에서 stdlib json 대비 3-10x
+    default_response_class=ORJSONResponse,
+)
+
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(health.router, prefix="/api/v1")
+app.include_router(upload.router, prefix="/api/v1")
+app.include_router(action.router, prefix="/api/v1")
+
+app.add_middleware(ResponseCacheMiddleware)
+
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    request_id = str(uuid.uuid4())
+    # perf_counter_ns: 단조 시계(VDSO), float 변환 없음
+    start_ns = time.perf_counter_ns()
+
+    response = await call_next(request)
+    elapsed_ns = time.perf_counter_ns() - start_ns
+
+    response.headers["X-Request-ID"] = request_id
+    response.headers["X-Process-Time"] = str(elapsed_ns / 1e9)
+    # %-스타일 지연 포매팅: 핸들러가 실제로 기록할 때만 문자열을 만든다
+    logger.info(
+        "req %s %s id=%s status=%d ns=%d",
+        request.method, request.url.path, request_id,
+        response.status_code, elapsed_ns,
+    )
+    return response
+
+
+@app.exception_handler(Exception)
+async def global_exception_handler(request: Request, exc: Exception):
+    logger.error(f"Unhandled error on {request.url.path}: {exc}")
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"},
+    )
+
+
+@app.get("/")
+async def root():
+    return {
+        "name": settings.app_name,
+        "version": settings.version,
+        "instance_id": settings.instance_id,
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 지표 (에이전트 캐시 카운터 포함)"""
+    for name, value in get_search_agent().stats().items():
+        _CACHE_GAUGE.labels(metric=name).set(value)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=settings.max_workers,
+        # uvloop + httptools: async 위주 워크로드에서 기본 asyncio+h11 대비
+        # 처리량 약 2배
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+    )
@@ -0,0 +1,92 @@
+"""응답 캐시 미들웨어
+
+로드밸런서가 초 단위로 두드리는 /health와 반복 조회가 많은 /search에
+대해, 직전 응답 바디를 Redis에 짧은 TTL로 저장해 두고 히트 시 핸들러와
+백엔드를 건드리지 않고 그대로 돌려준다. 백엔드 장애 시에는 보관 중인
+stale 사본을 degraded 표시와 함께 내보낸다.
+"""
+import hashlib
+import logging
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# 경로별 (허용 메서드, fresh TTL 초). stale 사본은 fresh의 12배 보관.
+_CACHE_POLICIES = {
+    "/api/v1/health": ("GET", 5),
+    "/api/v1/search": ("POST", 15),
+}
+_STALE_FACTOR = 12
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._cache = None
+
+    def _get_cache(self):
+        if self._cache is None:
+            from dependencies import get_cache_service
+            self._cache = get_cache_service()
+        return self._cache
+
+    @staticmethod
+    def _make_key(path: str, body: bytes) -> str:
+        return hashlib.blake2b(
+            path.encode() + b"\x1f" + body, digest_size=16
+        ).hexdigest()
+
+    async def dispatch(self, request: Request, call_next):
+        policy = _CACHE_POLICIES.get(request.url.path)
+        if policy is None or request.method != policy[0]:
+            return await call_next(request)
+
+        ttl = policy[1]
+        # Starlette은 body를 내부 캐시하므로 다운스트림 핸들러도 재사용 가능
+        body = await request.body() if request.method == "POST" else b""
+        key = self._make_key(request.url.path, body)
+        cache = self._get_cache()
+
+        cached = await cache.get_bytes("resp", key)
+        if cached is not None:
+            return Response(
+                content=cached,
+                media_type="application/json",
+                headers={"X-Cache": "hit"},
+            )
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            # 백엔드 장애 → stale 사본으로 폴백
+            stale = await cache.get_bytes("resp-stale", key)
+            if stale is not None:
+                logger.warning(
+                    f"Serving stale cache for {request.url.path} after error"
+                )
+                return Response(
+                    content=stale,
+                    media_type="application/json",
+                    headers={"X-Cache": "stale", "X-Degraded": "1"},
+                )
+            raise
+
+        if response.status_code != 200:
+            return response
+
+        # 스트리밍 바디를 한 번 소진해 저장 후 재구성
+        chunks = [chunk async for chunk in response.body_iterator]
+        payload = b"".join(chunks)
+        await cache.set_bytes("resp", key, payload, ttl=ttl)
+        await cache.set_bytes("resp-stale", key, payload, ttl=ttl * _STALE_FACTOR)
+
+        return Response(
+            content=payload,
+            status_code=response.status_code,
+            media_type=response.media_type,
+            headers=dict(response.headers),
+        )
@@ -0,0 +1,92 @@
+"""API 요청/응답 모델"""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchType(str, Enum):
+    ALL = "all"
+    TEXT = "text"
+    IMAGE = "image"
+    DOCUMENT = "document"
+
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=1000)
+    search_type: SearchType = SearchType.ALL
+    top_k: int = Field(default=5, ge=1, le=50)
+    filters: Optional[Dict[str, Any]] = None
+
+
+class SearchResult(BaseModel):
+    id: str
+    content: str
+    score: float
+    metadata: Dict[str, Any] = {}
+    document_type: str = "text"
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    total: int
+    took_ms: float = 0.0
+    cached: bool = False
+
+
+class NaturalLanguageRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=2000)
+    stream: bool = False
+
+
+class NaturalLanguageResponse(BaseModel):
+    intent: str
+    entities: Dict[str, Any] = {}
+    search_results: List[SearchResult] = []
+    summary: str = ""
+    scheduled_actions: List[Dict[str, Any]] = []
+    response_text: str = ""
+
+
+class UploadResponse(BaseModel):
+    document_id: str
+    filename: str
+    file_url: str = ""
+    chunk_count: int = 0
+    status: str = "completed"
+
+
+class ActionRequest(BaseModel):
+    action_type: str
+    parameters: Dict[str, Any]
+    scheduled_time: Optional[datetime] = None
+
+
+class ActionResponse(BaseModel):
+    task_id: str
+    status: str
+    scheduled_time: Optional[datetime] = None
+
+
+class TaskStatusResponse(BaseModel):
+    task_id: str
+    status: str
+    result: Optional[Any] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ServiceHealth(BaseModel):
+    name: str
+    status: str
+    latency_ms: float = 0.0
+    detail: str = ""
+
+
+class HealthResponse(BaseModel):
+    status: str
+    version: str
+    instance_id: int
+    services: List[ServiceHealth] = []
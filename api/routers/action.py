@@ -0,0 +1,169 @@
+"""액션 API 라우터 (이메일/요약 예약, 태스크 상태 조회)"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+
+from dependencies import get_celery_app
+from models import ActionRequest, ActionResponse, TaskStatusResponse
+
+logger = logging.getLogger(__name__)
+
+# 요청 경로에서 매번 임포트하지 않는다: 첫 호출의 임포트 비용(수십~수백 ms)과
+# 이후 호출의 importlib 락 경합 모두 제거. 워커 코드가 없는 환경은 기동 시
+# 한 번만 판정해 mock 경로로 빠진다.
+try:
+    from celery import group
+    from workers.tasks import send_email_task, summarize_content_task
+    _celery_available = True
+except ImportError:
+    _celery_available = False
+    group = send_email_task = summarize_content_task = None
+
+router = APIRouter(prefix="/action", tags=["action"])
+
+# Celery 상태 → API 상태 매핑 (요청마다 dict를 새로 만들지 않는다)
+_CELERY_STATUS_MAP = {
+    "PENDING": "pending",
+    "RECEIVED": "pending",
+    "STARTED": "processing",
+    "RETRY": "processing",
+    "SUCCESS": "completed",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+
+def _mock_response(request: ActionRequest) -> ActionResponse:
+    """Celery 미설치/미연결 환경(로컬 개발)용 대체 응답"""
+    return ActionResponse(
+        task_id=f"mock-{uuid.uuid4()}",
+        status="mock",
+        scheduled_time=request.scheduled_time,
+    )
+
+
+@router.post("/email", response_model=ActionResponse)
+async def schedule_email(request: ActionRequest):
+    """이메일 발송 태스크를 큐에 등록"""
+    params = request.parameters
+    if not _celery_available:
+        return _mock_response(request)
+
+    if request.scheduled_time:
+        result = send_email_task.apply_async(
+            args=[params.get("to"), params.get("subject"), params.get("body")],
+            eta=request.scheduled_time,
+        )
+        status = "scheduled"
+    else:
+        result = send_email_task.delay(
+            params.get("to"), params.get("subject"), params.get("body")
+        )
+        status = "queued"
+
+    return ActionResponse(
+        task_id=result.id,
+        status=status,
+        scheduled_time=request.scheduled_time,
+    )
+
+
+@router.post("/email/batch", response_model=List[ActionResponse])
+async def schedule_email_batch(requests: List[ActionRequest]):
+    """이메일 태스크 일괄 등록
+
+    요청당 .delay() 호출은 건마다 브로커 LPUSH 왕복이다. group으로 묶으면
+    kombu가 발행을 파이프라인해 Redis 요청 1회로 끝난다.
+    """
+    if not requests:
+        return []
+
+    if not _celery_available:
+        return [_mock_response(r) for r in requests]
+
+    sigs = []
+    for r in requests:
+        p = r.parameters
+        sig = send_email_task.s(p.get("to"), p.get("subject"), p.get("body"))
+        if r.scheduled_time:
+            sig = sig.set(eta=r.scheduled_time)
+        sigs.append(sig)
+
+    group_result = group(sigs).apply_async()
+    return [
+        ActionResponse(
+            task_id=child.id,
+            status="scheduled" if r.scheduled_time else "queued",
+            scheduled_time=r.scheduled_time,
+        )
+        for child, r in zip(group_result.children, requests)
+    ]
+
+
+@router.post("/summarize", response_model=ActionResponse)
+async def schedule_summarize(request: ActionRequest):
+    """요약 태스크를 큐에 등록"""
+    params = request.parameters
+    content = params.get("content")
+    if not content:
+        raise HTTPException(status_code=422, detail="parameters.content required")
+
+    if not _celery_available:
+        return _mock_response(request)
+
+    result = summarize_content_task.delay(
+        content, params.get("max_length", 500)
+    )
+    return ActionResponse(task_id=result.id, status="queued")
+
+
+@router.get("/task/{task_id}", response_model=TaskStatusResponse)
+async def get_task_status(task_id: str):
+    """태스크 상태 조회
+
+    AsyncResult의 .state/.result/.successful() 접근자는 각각 결과 백엔드를
+    왕복한다. 메타 블롭을 파이프라인 GET 1회로 가져와 한 번만 디코딩한다.
+    """
+    try:
+        celery_app = get_celery_app()
+    except ImportError:
+        raise HTTPException(status_code=503, detail="task backend unavailable")
+
+    def _fetch_meta():
+        backend = celery_app.backend
+        pipe = backend.client.pipeline()
+        pipe.get(backend.get_key_for_task(task_id))
+        raw, = pipe.execute()
+        if raw is None:
+            return None
+        return backend.decode(raw)
+
+    try:
+        meta = await asyncio.to_thread(_fetch_meta)
+    except Exception as e:
+        logger.warning(f"Task meta fetch failed for {task_id}: {e}")
+        raise HTTPException(status_code=503, detail="task backend unavailable")
+
+    if meta is None:
+        state = "PENDING"
+        result = None
+        date_done = None
+    else:
+        state = meta.get("status", "PENDING")
+        result = meta.get("result") if state == "SUCCESS" else None
+        date_done = meta.get("date_done")
+
+    # 시스템 시계는 한 번만 읽는다. 완료 시각은 백엔드 메타의 date_done이
+    # 실제 값 — 조회 시각으로 덮어쓰지 않는다.
+    now = datetime.now(timezone.utc)
+    return TaskStatusResponse(
+        task_id=task_id,
+        status=_CELERY_STATUS_MAP.get(state, "pending"),
+        result=result,
+        created_at=now,
+        updated_at=date_done or now,
+    )
@@ -0,0 +1,167 @@
+"""헬스체크 API 라우터"""
+import asyncio
+import logging
+import time
+from typing import List
+
+from fastapi import APIRouter, Depends
+
+from config import Settings
+from dependencies import (
+    get_db_engine,
+    get_http_client,
+    get_milvus_alias,
+    get_redis_pool,
+    get_settings,
+)
+from models import HealthResponse, ServiceHealth
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+# 백엔드 하나가 SYN 단계에서 멈추면 OS 기본 ~75s까지 끌려간다 — 프로브는
+# 2초 안에 판정한다
+_PROBE_TIMEOUT = 2.0
+
+
+async def _bounded(name: str, coro) -> ServiceHealth:
+    try:
+        return await asyncio.wait_for(coro, timeout=_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return ServiceHealth(
+            name=name, status="unhealthy",
+            detail=f"probe timed out after {_PROBE_TIMEOUT}s",
+        )
+
+
+async def _check_redis(settings: Settings) -> ServiceHealth:
+    started = time.perf_counter()
+
+    def _ping():
+        import redis
+        # 공유 커넥션 풀 재사용 — 프로브마다 새 TCP 연결을 맺지 않는다
+        redis.Redis(connection_pool=get_redis_pool()).ping()
+
+    try:
+        # redis-py는 동기 클라이언트 → 이벤트 루프를 막지 않게 스레드로
+        await asyncio.to_thread(_ping)
+        return ServiceHealth(
+            name="redis", status="healthy",
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+    except Exception as e:
+        return ServiceHealth(name="redis", status="unhealthy", detail=str(e))
+
+
+async def _check_postgres(settings: Settings) -> ServiceHealth:
+    started = time.perf_counter()
+
+    def _probe():
+        from sqlalchemy import text
+        with get_db_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.to_thread(_probe)
+        return ServiceHealth(
+            name="postgres", status="healthy",
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+    except Exception as e:
+        return ServiceHealth(name="postgres", status="unhealthy", detail=str(e))
+
+
+async def _check_milvus(settings: Settings) -> ServiceHealth:
+    started = time.perf_counter()
+
+    def _probe():
+        from pymilvus import utility
+        utility.list_collections(using=get_milvus_alias())
+
+    try:
+        await asyncio.to_thread(_probe)
+        return ServiceHealth(
+            name="milvus", status="healthy",
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+    except Exception as e:
+        return ServiceHealth(name="milvus", status="unhealthy", detail=str(e))
+
+
+async def _check_ollama(settings: Settings) -> ServiceHealth:
+    started = time.perf_counter()
+    try:
+        response = await get_http_client().get(
+            f"{settings.ollama_endpoint_list[0]}/api/tags"
+        )
+        response.raise_for_status()
+        return ServiceHealth(
+            name="ollama", status="healthy",
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+    except Exception as e:
+        return ServiceHealth(name="ollama", status="unhealthy", detail=str(e))
+
+
+@router.get("/livez")
+async def liveness():
+    """프로세스 생존 확인 — 백엔드 I/O 없음
+
+    쿠버네티스 liveness처럼 수 초 주기로 때리는 프로브가 백엔드 4곳을
+    왕복하게 두면 프로브 QPS가 그대로 백엔드 부하가 된다. 생존 판정은
+    이벤트 루프가 응답하는지만 보면 충분하다.
+    """
+    return {"status": "ok"}
+
+
+async def _gather_service_health(settings: Settings) -> List[ServiceHealth]:
+    """백엔드 4종 프로브를 동시 실행해 상태 목록을 만든다
+
+    프로브는 서로 독립이므로 gather로 묶는다 — 전체 지연이 합이 아닌
+    가장 느린 프로브 수준으로 떨어진다.
+    """
+    results = await asyncio.gather(
+        _bounded("redis", _check_redis(settings)),
+        _bounded("postgres", _check_postgres(settings)),
+        _bounded("milvus", _check_milvus(settings)),
+        _bounded("ollama", _check_ollama(settings)),
+        return_exceptions=True,
+    )
+    return [
+        r if isinstance(r, ServiceHealth)
+        else ServiceHealth(name="unknown", status="unhealthy", detail=str(r))
+        for r in results
+    ]
+
+
+@router.get("", response_model=HealthResponse)
+async def health_check(settings: Settings = Depends(get_settings)):
+    """전체 백엔드 헬스체크"""
+    services = await _gather_service_health(settings)
+    unhealthy = sum(1 for s in services if s.status != "healthy")
+    if unhealthy == 0:
+        overall = "healthy"
+    elif unhealthy < len(services):
+        overall = "degraded"
+    else:
+        overall = "unhealthy"
+
+    return HealthResponse(
+        status=overall,
+        version=settings.version,
+        instance_id=settings.instance_id,
+        services=services,
+    )
+
+
+@router.get("/readyz", response_model=HealthResponse)
+async def readiness(settings: Settings = Depends(get_settings)):
+    """준비 상태 확인 — 백엔드 4종 전수 프로브 (readiness 전용 경로)"""
+    return await health_check(settings)
+
+
+@router.get("/services", response_model=List[ServiceHealth])
+async def service_health(settings: Settings = Depends(get_settings)):
+    """백엔드별 상태 목록 — HealthResponse 래핑 없이 프로브 결과만"""
+    return await _gather_service_health(settings)
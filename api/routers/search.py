@@ -0,0 +1,167 @@
+"""검색 API 라우터"""
+import logging
+import time
+
+from typing import Optional
+
+import msgpack
+import orjson
+import xxhash
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+
+from config import settings
+from dependencies import (
+    get_cache_service,
+    get_embedding_service,
+    get_search_agent,
+    get_vector_store,
+)
+from models import (
+    NaturalLanguageRequest,
+    NaturalLanguageResponse,
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    SearchType,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _etag_response(body: bytes, if_none_match: Optional[str]) -> Response:
+    """약한 ETag 부여 + If-None-Match 재검증
+
+    페이지네이션/폴링 트래픽의 반복 조회는 본문이 그대로인 경우가 대부분 —
+    일치하면 수 KB JSON 대신 304 헤더만 내려보낸다(대역폭 절감).
+    """
+    etag = f'W/"{xxhash.xxh3_64_hexdigest(body)}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
+    )
+
+
+@router.post("", response_model=SearchResponse)
+async def search(
+    request: SearchRequest,
+    if_none_match: Optional[str] = Header(None),
+    cache_service=Depends(get_cache_service),
+    embedding_service=Depends(get_embedding_service),
+    vector_store=Depends(get_vector_store),
+):
+    """벡터 유사도 검색"""
+    started = time.time()
+
+    # msgpack 튜플 직렬화: str 조립+인코딩 없이 바로 bytes, 구분자 충돌 원천
+    # 차단. filters를 키에 접어 넣어 필터 검색과 무필터 검색이 같은 캐시 항목을
+    # 공유하던 버그도 함께 고친다.
+    cache_key = xxhash.xxh3_128_hexdigest(msgpack.packb((
+        request.query,
+        request.search_type.value,
+        request.top_k,
+        tuple(sorted((request.filters or {}).items())),
+    )))
+
+    # 히트 경로는 직렬화된 바이트를 그대로 반환 — pydantic 재검증 없음
+    cached_body = await cache_service.get_bytes("search", cache_key)
+    if cached_body:
+        return _etag_response(cached_body, if_none_match)
+
+    try:
+        query_embedding = await embedding_service.embed_text(request.query)
+
+        if request.search_type == SearchType.ALL:
+            raw_results = await vector_store.search_all(
+                query_embedding, top_k=request.top_k
+            )
+        else:
+            raw_results = await vector_store.search(
+                request.search_type.value,
+                query_embedding,
+                top_k=request.top_k,
+                filters=request.filters,
+            )
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        raise HTTPException(status_code=500, detail="search failed")
+
+    response = SearchResponse(
+        query=request.query,
+        results=[SearchResult(**r) for r in raw_results],
+        total=len(raw_results),
+        took_ms=(time.time() - started) * 1000,
+    )
+
+    # orjson: 수십 개 float 필드가 실리는 응답에서 stdlib json 대비 수 배
+    body = orjson.dumps(response.model_dump())
+    # 저장본은 cached=true로 한 번 더 직렬화해 둔다 — 미스 1회의 추가 직렬화로
+    # 이후 모든 히트에서 파싱/검증/플래그 변경이 사라진다
+    response.cached = True
+    await cache_service.set_bytes(
+        "search", cache_key, orjson.dumps(response.model_dump()), ttl=settings.cache_ttl
+    )
+    return _etag_response(body, if_none_match)
+
+
+@router.post("/natural")
+async def search_natural(
+    request: NaturalLanguageRequest,
+    agent=Depends(get_search_agent),
+):
+    """자연어 검색 (요약 의도 시 NDJSON 스트리밍 지원)
+
+    ``stream=true``면 검색 결과를 먼저 내보내고 요약 토큰을 생성 즉시
+    NDJSON 라인으로 스트리밍한다. 메일 스케줄링은 요약 누적이 끝난 뒤
+    수행되므로 동작은 비스트리밍 경로와 동일하다.
+    """
+    if request.stream:
+        return StreamingResponse(
+            agent.process_natural_language_stream(request.query),
+            media_type="application/x-ndjson",
+        )
+
+    result = await agent.process_natural_language(request.query)
+    return NaturalLanguageResponse(**result)
+
+
+@router.get("/similar/{document_id}", response_model=SearchResponse)
+async def find_similar(
+    document_id: str,
+    top_k: int = 5,
+    if_none_match: Optional[str] = Header(None),
+    cache_service=Depends(get_cache_service),
+    vector_store=Depends(get_vector_store),
+):
+    """특정 문서와 유사한 문서 검색"""
+    started = time.time()
+
+    cache_key = xxhash.xxh3_128_hexdigest(
+        f"similar\x1f{document_id}\x1f{top_k}".encode()
+    )
+    cached_body = await cache_service.get_bytes("search", cache_key)
+    if cached_body:
+        return _etag_response(cached_body, if_none_match)
+
+    try:
+        raw_results = await vector_store.search_similar_to(document_id, top_k=top_k)
+    except Exception as e:
+        logger.error(f"Similar search failed: {e}")
+        raise HTTPException(status_code=500, detail="similar search failed")
+
+    response = SearchResponse(
+        query=document_id,
+        results=[SearchResult(**r) for r in raw_results],
+        total=len(raw_results),
+        took_ms=(time.time() - started) * 1000,
+    )
+    body = orjson.dumps(response.model_dump())
+    response.cached = True
+    await cache_service.set_bytes(
+        "search", cache_key, orjson.dumps(response.model_dump()), ttl=settings.cache_ttl
+    )
+    return _etag_response(body, if_none_match)
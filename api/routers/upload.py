@@ -0,0 +1,322 @@
+"""업로드 API 라우터 (텍스트/이미지/문서)"""
+import asyncio
+import logging
+import os
+import tempfile
+import uuid
+from typing import Optional
+
+import aiofiles
+from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
+
+from config import settings
+from dependencies import (
+    get_embedding_service,
+    get_file_service,
+    get_llm_service,
+    get_search_agent,
+    get_vector_store,
+)
+from models import UploadResponse
+from utils.text_processing import (
+    clean_text,
+    extract_keywords,
+    extract_text_from_stream,
+    smart_chunk,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/upload", tags=["upload"])
+
+# 업로드 스풀 읽기 단위 (1MiB) — 전체 파일을 메모리에 올리지 않는다
+_READ_CHUNK = 1 << 20
+
+# 스풀 디렉터리: /dev/shm(tmpfs)이 있으면 디스크 대신 메모리에 쓴다 —
+# ext4 저널링/동기화 비용이 사라지고 unlink도 공짜다
+_SPOOL_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _make_temp_path(document_id: str, filename: Optional[str]) -> str:
+    """업로드 스풀용 임시 파일 생성
+
+    클라이언트가 보낸 filename을 경로에 섞지 않는다('/' 포함 시 탈출 위험).
+    확장자만 보존해 추출기 디스패치가 동작하게 한다.
+    """
+    suffix = os.path.splitext(os.path.basename(filename or ""))[1]
+    tmp = tempfile.NamedTemporaryFile(
+        dir=_SPOOL_DIR, prefix=f"{document_id}_", suffix=suffix, delete=False
+    )
+    tmp.close()
+    return tmp.name
+
+
+def _cleanup_temp(temp_path: str) -> None:
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def _build_chunk_rows(
+    document_id: str,
+    chunks: list,
+    file: UploadFile,
+    file_url: str,
+    keywords: list,
+    title: Optional[str],
+):
+    """청크별 id/메타데이터 행 생성
+
+    문서 불변 필드(키워드 CSV 포함)는 공유 템플릿에 한 번만 만들고
+    청크마다 위치 필드 3개만 얹는다 — 1000+ 청크 문서에서 dict 조립과
+    ",".join 반복 비용이 사라진다.
+    """
+    shared_meta = {
+        "parent_document_id": document_id,
+        "chunk_count": len(chunks),
+        "filename": file.filename,
+        "file_url": file_url,
+        "content_type": file.content_type,
+        "keywords": ",".join(keywords),
+        "title": title or file.filename,
+        "chunking_method": "smart",
+    }
+    ids = []
+    metadatas = []
+    for chunk_data in chunks:
+        ids.append(f"{document_id}_{chunk_data['chunk_index']}")
+        metadatas.append({
+            **shared_meta,
+            "chunk_index": chunk_data['chunk_index'],
+            "char_start": chunk_data.get('char_start', 0),
+            "char_end": chunk_data.get('char_end', 0),
+        })
+    return ids, metadatas
+
+
+async def _reap_tasks(*tasks) -> None:
+    """실패 경로 뒷정리 — 띄워 둔 태스크를 취소하고 회수한다
+
+    핸들러가 태스크를 await하기 전에 예외로 빠지면 "Task exception was
+    never retrieved" 경고가 남고, 업로드 태스크는 실패한 요청의 고아
+    객체를 버킷에 계속 올린다. 이미 끝난 태스크는 결과/예외만 소비한다.
+    """
+    for task in tasks:
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+async def _spool_to_temp(file: UploadFile, temp_path: str) -> int:
+    """UploadFile을 청크 단위로 임시 파일에 스트리밍하고 크기를 반환"""
+    size = 0
+    async with aiofiles.open(temp_path, 'wb') as out:
+        while chunk := await file.read(_READ_CHUNK):
+            await out.write(chunk)
+            size += len(chunk)
+    return size
+
+
+@router.post("/text", response_model=UploadResponse)
+async def upload_text(
+    file: UploadFile,
+    title: Optional[str] = Form(None),
+    embedding_service=Depends(get_embedding_service),
+    vector_store=Depends(get_vector_store),
+    file_service=Depends(get_file_service),
+    search_agent=Depends(get_search_agent),
+):
+    """텍스트 파일 업로드 → 청킹 → 임베딩 → 인덱싱"""
+    document_id = str(uuid.uuid4())
+    upload_task = keywords_task = None
+
+    try:
+        # /tmp 왕복 제거: 업로드 스풀(file.file)에서 바로 추출하고, 되감은
+        # 같은 스트림을 MinIO 멀티파트로 직접 올린다. 피크 메모리는 파일
+        # 크기가 아니라 파트 크기에 비례
+        text_content = await asyncio.to_thread(
+            extract_text_from_stream, file.file, file.filename
+        )
+        await asyncio.to_thread(file.file.seek, 0)
+        upload_task = asyncio.create_task(file_service.upload_stream(
+            file.file,
+            f"texts/{document_id}_{file.filename}",
+            content_type=file.content_type,
+        ))
+
+        cleaned_text = clean_text(text_content)
+        # 키워드 추출은 메타데이터 조립 전까지만 끝나면 된다 — 스레드로
+        # 띄워 두고 청킹/임베딩의 네트워크 대기와 겹친다
+        keywords_task = asyncio.create_task(
+            asyncio.to_thread(extract_keywords, cleaned_text, 10)
+        )
+        chunks = await asyncio.to_thread(
+            smart_chunk,
+            cleaned_text,
+            chunk_size=settings.chunk_size,
+            overlap=settings.chunk_overlap,
+        )
+
+        # 청크별 직렬 임베딩→삽입(N회 왕복) 대신 배치 임베딩 1회 + 다행
+        # 삽입 1회 — 벽시계 시간이 sum이 아닌 max(batch) 수준으로 떨어진다
+        contents = [c['content'] for c in chunks]
+        embeddings = await embedding_service.embed_texts_batch(
+            contents, batch_size=32
+        )
+        file_url = await upload_task
+        keywords = await keywords_task
+
+        ids, metadatas = _build_chunk_rows(
+            document_id, chunks, file, file_url, keywords, title
+        )
+        await vector_store.insert_text_bulk(ids, contents, embeddings, metadatas)
+        # 인덱스가 바뀌었으므로 에이전트 결과 캐시를 전 레플리카에서 비운다
+        await search_agent.broadcast_invalidation()
+
+        return UploadResponse(
+            document_id=document_id,
+            filename=file.filename,
+            file_url=file_url,
+            chunk_count=len(chunks),
+        )
+    except HTTPException:
+        await _reap_tasks(upload_task, keywords_task)
+        raise
+    except Exception as e:
+        logger.error(f"Text upload failed: {e}")
+        await _reap_tasks(upload_task, keywords_task)
+        raise HTTPException(status_code=500, detail="upload failed")
+
+
+@router.post("/image", response_model=UploadResponse)
+async def upload_image(
+    file: UploadFile,
+    description: Optional[str] = Form(None),
+    embedding_service=Depends(get_embedding_service),
+    vector_store=Depends(get_vector_store),
+    file_service=Depends(get_file_service),
+    llm_service=Depends(get_llm_service),
+    search_agent=Depends(get_search_agent),
+):
+    """이미지 업로드 → 설명 생성 → 임베딩 → 인덱싱"""
+    document_id = str(uuid.uuid4())
+    temp_path = _make_temp_path(document_id, file.filename)
+    upload_task = embed_task = None
+
+    try:
+        await _spool_to_temp(file, temp_path)
+
+        # 업로드/설명 생성/임베딩은 서로 독립 — 동시 실행해 벽시계 시간을
+        # sum()이 아니라 max()로 줄인다
+        upload_task = asyncio.create_task(file_service.upload_file(
+            temp_path,
+            f"images/{document_id}_{file.filename}",
+            content_type=file.content_type,
+        ))
+        embed_task = asyncio.create_task(
+            embedding_service.embed_image(temp_path)
+        )
+        if description:
+            file_url, embedding = await asyncio.gather(upload_task, embed_task)
+        else:
+            file_url, embedding, description = await asyncio.gather(
+                upload_task, embed_task, llm_service.analyze_image(temp_path)
+            )
+        metadata = {
+            "filename": file.filename,
+            "file_url": file_url,
+            "content_type": file.content_type,
+            "description": description,
+        }
+        await vector_store.insert_image(
+            document_id, description, embedding, metadata
+        )
+        await search_agent.broadcast_invalidation()
+
+        return UploadResponse(
+            document_id=document_id,
+            filename=file.filename,
+            file_url=file_url,
+            chunk_count=1,
+        )
+    except HTTPException:
+        await _reap_tasks(upload_task, embed_task)
+        raise
+    except Exception as e:
+        # gather는 첫 예외에서 빠져나올 뿐 나머지 태스크를 취소하지 않는다
+        logger.error(f"Image upload failed: {e}")
+        await _reap_tasks(upload_task, embed_task)
+        raise HTTPException(status_code=500, detail="upload failed")
+    finally:
+        await asyncio.to_thread(_cleanup_temp, temp_path)
+
+
+@router.post("/document", response_model=UploadResponse)
+async def upload_document(
+    file: UploadFile,
+    title: Optional[str] = Form(None),
+    embedding_service=Depends(get_embedding_service),
+    vector_store=Depends(get_vector_store),
+    file_service=Depends(get_file_service),
+    search_agent=Depends(get_search_agent),
+):
+    """PDF/DOCX 문서 업로드 → 본문 추출 → 청킹 → 임베딩 → 인덱싱"""
+    document_id = str(uuid.uuid4())
+    upload_task = keywords_task = None
+
+    try:
+        # /tmp 왕복 제거 — upload_text와 동일하게 스풀에서 직접 처리
+        text_content = await asyncio.to_thread(
+            extract_text_from_stream, file.file, file.filename
+        )
+        await asyncio.to_thread(file.file.seek, 0)
+        upload_task = asyncio.create_task(file_service.upload_stream(
+            file.file,
+            f"documents/{document_id}_{file.filename}",
+            content_type=file.content_type,
+        ))
+
+        cleaned_text = clean_text(text_content)
+        keywords_task = asyncio.create_task(
+            asyncio.to_thread(extract_keywords, cleaned_text, 15)
+        )
+        chunks = await asyncio.to_thread(
+            smart_chunk,
+            cleaned_text,
+            chunk_size=settings.chunk_size,
+            overlap=settings.chunk_overlap,
+        )
+
+        contents = [c['content'] for c in chunks]
+        embeddings = await embedding_service.embed_texts_batch(
+            contents, batch_size=32
+        )
+        file_url = await upload_task
+        keywords = await keywords_task
+
+        ids, metadatas = _build_chunk_rows(
+            document_id, chunks, file, file_url, keywords, title
+        )
+        await vector_store.insert_document_bulk(
+            ids, contents, embeddings, metadatas
+        )
+        await search_agent.broadcast_invalidation()
+
+        return UploadResponse(
+            document_id=document_id,
+            filename=file.filename,
+            file_url=file_url,
+            chunk_count=len(chunks),
+        )
+    except HTTPException:
+        await _reap_tasks(upload_task, keywords_task)
+        raise
+    except Exception as e:
+        logger.error(f"Document upload failed: {e}")
+        await _reap_tasks(upload_task, keywords_task)
+        raise HTTPException(status_code=500, detail="upload failed")
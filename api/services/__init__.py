@@ -0,0 +1,4 @@
+from services.cache_service import CacheService
+from services.embed_batcher import EmbedBatcher
+
+__all__ = ["CacheService", "EmbedBatcher"]
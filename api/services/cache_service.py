@@ -0,0 +1,178 @@
+"""Redis 캐시 서비스"""
+import logging
+from typing import Any, Dict, List, Optional
+
+import orjson
+import redis.asyncio as redis
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheService:
+    """네임스페이스 기반 Redis 캐시
+
+    redis.asyncio 클라이언트 사용 — 동기 클라이언트를 async def 안에서
+    호출하면 await가 실제로는 양보하지 않고 이벤트 루프를 막는다.
+    """
+
+    # mget/pipeline 한 번에 싣는 키 상한 (초대형 커맨드 방지)
+    _MGET_CHUNK = 1000
+
+    def __init__(self, redis_url: Optional[str] = None):
+        url = redis_url or settings.redis_url
+        self.redis_client = redis.from_url(
+            url, decode_responses=True, max_connections=50
+        )
+        # 바이너리 페이로드(임베딩 벡터 등)용 별도 연결 풀
+        self.redis_binary = redis.from_url(
+            url, decode_responses=False, max_connections=50
+        )
+
+    def _make_key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        try:
+            value = await self.redis_client.get(self._make_key(namespace, key))
+            return orjson.loads(value) if value else None
+        except Exception as e:
+            logger.warning(f"Cache get failed: {e}")
+            return None
+
+    async def set(
+        self, namespace: str, key: str, value: Any, ttl: int = 3600
+    ) -> bool:
+        try:
+            # orjson: float 다량 페이로드(임베딩 등)에서 stdlib json 대비 수 배
+            await self.redis_client.setex(
+                self._make_key(namespace, key), ttl, orjson.dumps(value)
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set failed: {e}")
+            return False
+
+    async def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        """원시 바이트 조회 (임베딩 등 바이너리 페이로드)"""
+        try:
+            return await self.redis_binary.get(self._make_key(namespace, key))
+        except Exception as e:
+            logger.warning(f"Cache get_bytes failed: {e}")
+            return None
+
+    async def set_bytes(
+        self, namespace: str, key: str, value: bytes, ttl: int = 3600
+    ) -> bool:
+        try:
+            await self.redis_binary.setex(self._make_key(namespace, key), ttl, value)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set_bytes failed: {e}")
+            return False
+
+    async def delete(self, namespace: str, key: str) -> bool:
+        try:
+            return bool(await self.redis_client.delete(self._make_key(namespace, key)))
+        except Exception as e:
+            logger.warning(f"Cache delete failed: {e}")
+            return False
+
+    async def exists(self, namespace: str, key: str) -> bool:
+        try:
+            return bool(await self.redis_client.exists(self._make_key(namespace, key)))
+        except Exception as e:
+            logger.warning(f"Cache exists failed: {e}")
+            return False
+
+    async def iter_keys(self, namespace: str, count: int = 1000):
+        """네임스페이스 내 키 이터레이션 (프리픽스 제거 후 반환)
+
+        SCAN 기반이라 KEYS처럼 서버를 멈추지 않는다 — 기동 시 블룸 필터
+        시딩 같은 전수 순회용.
+        """
+        prefix = f"{namespace}:"
+        async for raw in self.redis_client.scan_iter(
+            match=f"{prefix}*", count=count
+        ):
+            yield raw[len(prefix):]
+
+    async def publish(self, channel: str, message: str = "1") -> bool:
+        """채널 발행 (레플리카 간 캐시 무효화 브로드캐스트 등)"""
+        try:
+            await self.redis_client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache publish failed: {e}")
+            return False
+
+    def pubsub(self):
+        """구독용 PubSub 핸들 (수신 루프는 호출자가 관리)"""
+        return self.redis_client.pubsub()
+
+    async def batch_get(
+        self, namespace: str, keys: List[str]
+    ) -> Dict[str, Any]:
+        try:
+            key_list = [self._make_key(namespace, k) for k in keys]
+            if len(key_list) <= self._MGET_CHUNK:
+                values = await self.redis_client.mget(key_list)
+            else:
+                # 키가 많으면 mget을 쪼개되 파이프라인으로 묶어 왕복은 1회
+                pipe = self.redis_client.pipeline(transaction=False)
+                for i in range(0, len(key_list), self._MGET_CHUNK):
+                    pipe.mget(key_list[i:i + self._MGET_CHUNK])
+                values = [v for chunk in await pipe.execute() for v in chunk]
+            return {
+                k: orjson.loads(v) for k, v in zip(keys, values) if v is not None
+            }
+        except Exception as e:
+            logger.warning(f"Cache batch_get failed: {e}")
+            return {}
+
+    async def batch_set(
+        self, namespace: str, items: Dict[str, Any], ttl: int = 3600
+    ) -> bool:
+        """여러 키를 파이프라인 SETEX 1회 왕복으로 기록"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for k, v in items.items():
+                pipe.setex(self._make_key(namespace, k), ttl, orjson.dumps(v))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache batch_set failed: {e}")
+            return False
+
+    async def batch_get_bytes(
+        self, namespace: str, keys: List[str]
+    ) -> Dict[str, bytes]:
+        """바이너리 페이로드 일괄 조회 (임베딩 배치용)"""
+        try:
+            key_list = [self._make_key(namespace, k) for k in keys]
+            if len(key_list) <= self._MGET_CHUNK:
+                values = await self.redis_binary.mget(key_list)
+            else:
+                pipe = self.redis_binary.pipeline(transaction=False)
+                for i in range(0, len(key_list), self._MGET_CHUNK):
+                    pipe.mget(key_list[i:i + self._MGET_CHUNK])
+                values = [v for chunk in await pipe.execute() for v in chunk]
+            return {k: v for k, v in zip(keys, values) if v is not None}
+        except Exception as e:
+            logger.warning(f"Cache batch_get_bytes failed: {e}")
+            return {}
+
+    async def batch_set_bytes(
+        self, namespace: str, items: Dict[str, bytes], ttl: int = 3600
+    ) -> bool:
+        """바이너리 페이로드 일괄 기록 (임베딩 배치용)"""
+        try:
+            pipe = self.redis_binary.pipeline(transaction=False)
+            for k, v in items.items():
+                pipe.setex(self._make_key(namespace, k), ttl, v)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache batch_set_bytes failed: {e}")
+            return False
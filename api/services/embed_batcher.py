@@ -0,0 +1,102 @@
+"""임베딩 마이크로 배처
+
+동시 500명 부하에서는 수 ms 간격으로 embed 요청이 몰려 들어온다.
+요청마다 Ollama HTTP 왕복을 하는 대신, 짧은 수집 윈도(기본 8ms) 안에
+도착한 요청을 하나의 배치 호출로 묶어 per-request 오버헤드를 상쇄한다.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbedBatcher:
+    """embed 호출을 배치로 묶어주는 프로세스 단위 큐
+
+    사용: ``vec = await batcher.embed(text)``
+    내부적으로 (text, Future) 쌍을 큐에 넣고, 백그라운드 태스크가
+    최대 ``max_batch``개 또는 ``window_ms`` 경과 시점까지 모아
+    ``llm_service.embed_batch``를 한 번 호출한 뒤 Future들을 해소한다.
+    """
+
+    def __init__(self, llm_service, max_batch: int = 32, window_ms: float = 8.0):
+        self.llm_service = llm_service
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: asyncio.Task = None
+        self._batches = 0
+        self._items = 0
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain_loop())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def embed(self, text: str) -> List[float]:
+        """배치 윈도를 거쳐 단일 텍스트 임베딩"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _drain_loop(self) -> None:
+        while True:
+            text, future = await self._queue.get()
+            batch = [(text, future)]
+
+            # 윈도 내 추가 도착분 수집
+            deadline = asyncio.get_running_loop().time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        # 동일 윈도 내 중복 텍스트는 한 번만 임베딩
+        unique: Dict[str, List[asyncio.Future]] = {}
+        for text, future in batch:
+            unique.setdefault(text, []).append(future)
+
+        texts = list(unique.keys())
+        try:
+            embeddings = await self.llm_service.embed_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch embedding failed: {e}")
+            for futures in unique.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._items += len(batch)
+        for text, embedding in zip(texts, embeddings):
+            for future in unique[text]:
+                if not future.done():
+                    future.set_result(embedding)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "embed_batches": self._batches,
+            "embed_batched_items": self._items,
+            "embed_queue_depth": self._queue.qsize(),
+        }
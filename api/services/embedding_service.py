@@ -0,0 +1,349 @@
+"""임베딩 서비스 (텍스트: Ollama, 이미지: CLIP)"""
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+import numpy as np
+import ollama
+import xxhash
+
+from config import settings
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # 선택 의존성 — 없으면 네거티브 룩업 스킵 없이 동작
+    ScalableBloomFilter = None
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """텍스트/이미지 임베딩 생성 + Redis 캐싱"""
+
+    EMBED_CACHE_TTL = 86400  # 24h
+    # 실패한 엔드포인트를 후보에서 제외하는 시간
+    ENDPOINT_COOLDOWN = 30.0
+    # 동시에 날리는 서브배치 요청 상한
+    EMBED_CONCURRENCY = 5
+
+    def __init__(self, cache_service=None):
+        self.endpoints = settings.ollama_endpoint_list
+        self.embedding_model = settings.embedding_model
+        self.cache = cache_service
+        self._clip_model = None
+        # 최소 부하 선택용 상태 (이벤트 루프 단일 스레드라 락 불필요)
+        self._inflight = {ep: 0 for ep in self.endpoints}
+        self._cooldown_until = {ep: 0.0 for ep in self.endpoints}
+        # 엔드포인트당 AsyncClient 1개 재사용 — 호출마다 새 httpx.Client를
+        # 만들면 TCP 핸드셰이크를 반복하고 keep-alive도 버린다
+        self._clients = {
+            ep: ollama.AsyncClient(host=ep, timeout=30)
+            for ep in self.endpoints
+        }
+        # 네이티브 배치 embed API 지원 여부 (첫 호출에서 1회 판정)
+        self._native_batch: Optional[bool] = None
+        # 캐시에 있다고 알려진 키의 블룸 필터 — 신규 문서의 첫 임베딩처럼
+        # 확실한 미스 경로에서 Redis 왕복 자체를 건너뛴다 (FPR 1%).
+        # 프로세스 로컬이라 빈 채로 쓰면 재기동 직후 모든 히트를 미스로
+        # 오판한다 — warmup()에서 Redis 키를 시딩하기 전에는 비활성
+        self._bloom = (
+            ScalableBloomFilter(initial_capacity=100_000, error_rate=0.01)
+            if ScalableBloomFilter else None
+        )
+        self._bloom_ready = False
+
+    def _pick_endpoint(self) -> str:
+        """최소 재고(in-flight) 엔드포인트 선택
+
+        라운드로빈은 느려진 엔드포인트에도 제 몫을 계속 보내 gather 전체가
+        그쪽 꼬리 지연에 묶인다. 진행 중 요청이 가장 적은 곳을 고르고,
+        최근 실패한 곳은 쿨다운 동안 제외한다.
+        """
+        now = time.monotonic()
+        eligible = [
+            ep for ep in self.endpoints if self._cooldown_until[ep] <= now
+        ]
+        if not eligible:
+            # 전부 쿨다운이면 그래도 시도는 한다
+            eligible = self.endpoints
+        return min(eligible, key=lambda ep: self._inflight[ep])
+
+    @property
+    def clip_model(self):
+        """CLIP 모델 (첫 사용 시 로드)
+
+        GPU가 있으면 CUDA + FP16 — ViT-B/32 기준 CPU FP32 대비 이미지당
+        수십 배 빠르다. 출력은 convert_to_numpy 경로에서 float32로 내려와
+        Milvus 삽입에 그대로 쓸 수 있다.
+        """
+        if self._clip_model is None:
+            import torch
+            from sentence_transformers import SentenceTransformer
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            model = SentenceTransformer("clip-ViT-B-32", device=device)
+            if device == "cuda":
+                model = model.half()
+                # FP16이 못 타는 matmul 경로는 Ampere+에서 TF32로라도
+                torch.backends.cuda.matmul.allow_tf32 = True
+            self._clip_model = model
+        return self._clip_model
+
+    async def warmup(self) -> None:
+        """모델 선적재 (기동 시 1회)
+
+        CLIP 로드(~수 초)와 각 Ollama 엔드포인트의 임베딩 모델 GPU 적재를
+        첫 사용자 요청이 아니라 기동 시점에 치른다.
+        """
+        await asyncio.to_thread(lambda: self.clip_model)
+        results = await asyncio.gather(
+            *(
+                self._clients[ep].embeddings(
+                    model=self.embedding_model, prompt="warmup"
+                )
+                for ep in self.endpoints
+            ),
+            return_exceptions=True,
+        )
+        for ep, result in zip(self.endpoints, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Embedding warmup failed for {ep}: {result}")
+
+        # Redis에 이미 쌓인 임베딩 키로 블룸 필터를 시딩 — 이게 끝나야
+        # 네거티브 룩업 스킵이 켜진다 (빈 필터로 켜면 캐시가 쓰기 전용이 됨)
+        if self.cache and self._bloom is not None:
+            try:
+                seeded = 0
+                async for key in self.cache.iter_keys("embedding"):
+                    self._bloom.add(key)
+                    seeded += 1
+                self._bloom_ready = True
+                logger.info(f"Bloom filter seeded with {seeded} cached keys")
+            except Exception as e:
+                logger.warning(
+                    f"Bloom seeding failed, negative lookup disabled: {e}"
+                )
+
+    def _maybe_in_cache(self, cache_key: str) -> bool:
+        """블룸 필터 네거티브 룩업 — False면 Redis에 확실히 없다
+
+        시딩 전에는 항상 True(스킵 비활성) — 다른 레플리카가 쓴 키는
+        필터에 없을 수 있지만, 그 경우 비용은 재임베딩 1회일 뿐 결과는
+        동일하다.
+        """
+        if self._bloom is None or not self._bloom_ready:
+            return True
+        return cache_key in self._bloom
+
+    def _mark_cached(self, cache_key: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(cache_key)
+
+    def _generate_cache_key(self, content: str) -> str:
+        # xxh3_128: 캐시 키 용도로 충분한 충돌 저항 + MD5 대비 수십 배 빠름.
+        # 1500자 청크 단위로 매 호출 해싱하는 경로라 체감되는 차이다.
+        content_hash = xxhash.xxh3_128_hexdigest(content)
+        return f"{self.embedding_model}:{content_hash}"
+
+    async def _embed_remote(self, text: str) -> List[float]:
+        """Ollama 원격 호출만 — 캐시는 호출자가 관리"""
+        endpoint = self._pick_endpoint()
+        self._inflight[endpoint] += 1
+        try:
+            response = await self._clients[endpoint].embeddings(
+                model=self.embedding_model, prompt=text
+            )
+            return response["embedding"]
+        except Exception:
+            self._cooldown_until[endpoint] = (
+                time.monotonic() + self.ENDPOINT_COOLDOWN
+            )
+            raise
+        finally:
+            self._inflight[endpoint] -= 1
+
+    async def _embed_remote_batch(self, texts: List[str]) -> List[List[float]]:
+        """서브배치 임베딩 — 가능하면 HTTP 1회의 네이티브 embed API
+
+        최신 Ollama는 embed(input=[...])로 N개를 한 요청에 처리한다(서버가
+        forward pass도 배치). 구버전 클라이언트면 항목별 동시 호출로 폴백.
+        """
+        if self._native_batch is not False:
+            endpoint = self._pick_endpoint()
+            self._inflight[endpoint] += 1
+            try:
+                response = await self._clients[endpoint].embed(
+                    model=self.embedding_model, input=texts
+                )
+                self._native_batch = True
+                return response["embeddings"]
+            except AttributeError:
+                self._native_batch = False
+            except Exception:
+                self._cooldown_until[endpoint] = (
+                    time.monotonic() + self.ENDPOINT_COOLDOWN
+                )
+                raise
+            finally:
+                self._inflight[endpoint] -= 1
+        return list(await asyncio.gather(
+            *(self._embed_remote(t) for t in texts)
+        ))
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """텍스트 임베딩 (캐시 우선)
+
+        반환은 float32 ndarray — 캐시 히트는 np.frombuffer memcpy로 끝나고,
+        768개 PyFloat 객체를 만드는 .tolist()는 하지 않는다. pymilvus는
+        FLOAT_VECTOR에 ndarray를 그대로 받는다.
+        """
+        cache_key = self._generate_cache_key(text)
+        if self.cache and self._maybe_in_cache(cache_key):
+            cached = await self.cache.get_bytes("embedding", cache_key)
+            if cached is not None:
+                return np.frombuffer(cached, dtype=np.float32)
+
+        embedding = np.asarray(await self._embed_remote(text), dtype=np.float32)
+
+        if self.cache:
+            # float32 원시 바이트 저장: 768차원 기준 ~15KB ASCII JSON → 3KB,
+            # 직렬화 CPU도 포매팅 없이 memcpy 수준
+            await self.cache.set_bytes(
+                "embedding",
+                cache_key,
+                embedding.tobytes(),
+                ttl=self.EMBED_CACHE_TTL,
+            )
+            self._mark_cached(cache_key)
+        return embedding
+
+    async def embed_texts_batch(
+        self, texts: List[str], batch_size: int = 32
+    ) -> List[np.ndarray]:
+        """텍스트 배치 임베딩 (batch_size 단위로 동시 호출)
+
+        중복 청크(페이지마다 반복되는 헤더/목차/보일러플레이트)는 캐시 키
+        기준으로 한 번만 임베딩하고 결과를 원래 위치로 흩뿌린다. 캐시
+        조회/기록 모두 항목별 왕복 대신 파이프라인 1회 —
+        batch_get_bytes / batch_set_bytes.
+        """
+        keys = [self._generate_cache_key(t) for t in texts]
+        unique_texts: dict = {}
+        for key, text in zip(keys, texts):
+            unique_texts.setdefault(key, text)
+
+        # 블룸 필터가 통과시킨 키만 모아 MGET 1회로 조회 — 키당 직렬
+        # get은 1000청크 문서에서 Redis 왕복 1000번이다
+        lookup_keys = (
+            [k for k in unique_texts if self._maybe_in_cache(k)]
+            if self.cache else []
+        )
+        cached_map = (
+            await self.cache.batch_get_bytes("embedding", lookup_keys)
+            if lookup_keys else {}
+        )
+
+        emb_map: dict = {}
+        miss_keys = []
+        for key in unique_texts:
+            cached = cached_map.get(key)
+            if cached is not None:
+                emb_map[key] = np.frombuffer(cached, dtype=np.float32)
+            else:
+                miss_keys.append(key)
+
+        # 길이순 정렬: 서버는 서브배치를 최장 항목에 맞춰 패딩하므로, 100자
+        # 목차 청크와 1500자 본문 청크가 섞이면 패딩 토큰만 태운다. 비슷한
+        # 길이끼리 묶고, 결과 복원은 emb_map의 키 매핑이 그대로 해준다.
+        miss_keys.sort(key=lambda k: len(unique_texts[k]))
+
+        # 서브배치는 최소 부하 선택으로 엔드포인트에 흩어 보내되, 동시
+        # 요청 수는 세마포어로 상한 — 1만 청크 문서를 배치 32로 쪼개면
+        # 300+ 요청이 한꺼번에 나가 Ollama 큐만 밀어낸다
+        windows = [
+            miss_keys[j:j + batch_size]
+            for j in range(0, len(miss_keys), batch_size)
+        ]
+        sem = asyncio.Semaphore(self.EMBED_CONCURRENCY)
+
+        async def _embed_window(w: List[str]) -> List[List[float]]:
+            async with sem:
+                return await self._embed_remote_batch(
+                    [unique_texts[k] for k in w]
+                )
+
+        window_results = await asyncio.gather(
+            *(_embed_window(w) for w in windows)
+        )
+        for window, embeddings in zip(windows, window_results):
+            emb_map.update(
+                (k, np.asarray(e, dtype=np.float32))
+                for k, e in zip(window, embeddings)
+            )
+
+        if self.cache and miss_keys:
+            await self.cache.batch_set_bytes(
+                "embedding",
+                {k: emb_map[k].tobytes() for k in miss_keys},
+                ttl=self.EMBED_CACHE_TTL,
+            )
+            for k in miss_keys:
+                self._mark_cached(k)
+        return [emb_map[k] for k in keys]
+
+    async def embed_image(self, image_path: str) -> np.ndarray:
+        """이미지 임베딩 (CLIP) — 배치 경로 공유"""
+        embeddings = await self.embed_images_batch([image_path])
+        return embeddings[0]
+
+    async def embed_images_batch(
+        self, image_paths: List[str]
+    ) -> List[np.ndarray]:
+        """이미지 배치 임베딩
+
+        PIL 디코딩은 GIL을 푸는 C 코드라 스레드 풀에서 병렬로 돌리고,
+        디코딩된 배치를 CLIP forward 1회에 모아 넣는다.
+        """
+        from PIL import Image
+
+        def _decode(path: str):
+            with Image.open(path) as img:
+                img.load()
+                return img.convert("RGB")
+
+        images = await asyncio.gather(
+            *(asyncio.to_thread(_decode, p) for p in image_paths)
+        )
+        embeddings = await asyncio.to_thread(
+            self.clip_model.encode,
+            images,
+            batch_size=len(images),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        # FP16 모델 출력 대비 float32로 맞춰 Milvus 삽입 dtype을 고정
+        return [np.asarray(e, dtype=np.float32) for e in embeddings]
+
+    def compute_similarity(
+        self, embedding1: List[float], embedding2: List[float]
+    ) -> float:
+        """코사인 유사도 (단일 쌍)"""
+        # asarray + float32: 이미 ndarray면 복사 없음, float64 승격도 없음
+        a = np.asarray(embedding1, dtype=np.float32)
+        b = np.asarray(embedding2, dtype=np.float32)
+        denom = np.linalg.norm(a) * np.linalg.norm(b) + 1e-12
+        return float(a @ b / denom)
+
+    def compute_similarities(
+        self, query: List[float], corpus: List[List[float]]
+    ) -> List[float]:
+        """질의 1개 × 코퍼스 N개 코사인 유사도
+
+        쌍마다 np.dot을 도는 대신 행을 정규화해 BLAS GEMV 1회로 끝낸다 —
+        top-K 재랭킹처럼 K가 수십이면 수십 배 차이.
+        """
+        q = np.asarray(query, dtype=np.float32)
+        matrix = np.asarray(corpus, dtype=np.float32)
+        matrix = matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        return (matrix @ q).tolist()
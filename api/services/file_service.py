@@ -0,0 +1,221 @@
+"""MinIO 파일 저장 서비스
+
+minio-py는 동기 클라이언트라 메서드 하나가 S3 왕복 내내 이벤트 루프를
+막는다. 공개 메서드는 async로 두고 내부에서 스레드 풀로 내려보낸다 —
+호출부마다 to_thread를 기억할 필요가 없다.
+"""
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+import urllib3
+from minio import Minio
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileService:
+    """MinIO 오브젝트 스토리지 래퍼"""
+
+    # 경로 업로드 파트 크기/병렬도 — 기본 파트(5-8MB)는 파트 생성이
+    # 직렬화돼 대형 파일 처리량이 수 배 떨어진다
+    UPLOAD_PART_SIZE = 64 * 1024 * 1024
+    UPLOAD_PARALLELISM = 4
+    # presigned URL 캐시 상한 / 만료 여유
+    URL_CACHE_MAX = 10_000
+    URL_CACHE_SLACK = 60.0
+
+    def __init__(self):
+        # 기본 PoolManager는 maxsize=10 — 동시 업로드/다운로드가 그보다
+        # 많아지면 커넥션을 버리고 다시 맺는다. 풀을 키워 keep-alive를
+        # 유지하고, 일시 오류 재시도는 urllib3 수준에서 처리
+        http_client = urllib3.PoolManager(
+            num_pools=16,
+            maxsize=64,
+            block=False,
+            retries=urllib3.Retry(total=3, backoff_factor=0.2),
+        )
+        self.client = Minio(
+            settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=False,
+            http_client=http_client,
+        )
+        self.bucket = settings.minio_bucket
+        # 업로드/다운로드는 네트워크 대기에 더해 SDK 내부 체크섬(MD5/
+        # SHA256) CPU 작업이 섞인 블로킹 호출 — 공용 to_thread 풀을
+        # 점유해 다른 서비스의 오프로드를 굶기지 않도록 전용 풀에서 돌린다
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=(os.cpu_count() or 4) * 2,
+            thread_name_prefix="minio-io",
+        )
+        # (object_name, expires) → (url, 재사용 가능 기한) LRU
+        self._url_cache: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = (
+            OrderedDict()
+        )
+        self._ensure_bucket()
+
+    def _ensure_bucket(self) -> None:
+        try:
+            if not self.client.bucket_exists(self.bucket):
+                self.client.make_bucket(self.bucket)
+        except Exception as e:
+            logger.warning(f"Bucket check failed: {e}")
+
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """경로 업로드 — 길이를 알고 올리는 병렬 멀티파트
+
+        크기를 명시하면 SDK가 버퍼를 과할당하지 않고, 64MiB 파트 4개
+        병렬 전송으로 대형 파일에서 링크 대역폭을 채운다.
+        """
+        def _put() -> None:
+            length = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                self.client.put_object(
+                    self.bucket,
+                    object_name,
+                    f,
+                    length=length,
+                    part_size=self.UPLOAD_PART_SIZE,
+                    num_parallel_uploads=self.UPLOAD_PARALLELISM,
+                    content_type=content_type or "application/octet-stream",
+                )
+
+        await asyncio.get_running_loop().run_in_executor(self._io_pool, _put)
+        return f"minio://{self.bucket}/{object_name}"
+
+    async def upload_stream(
+        self,
+        stream,
+        object_name: str,
+        content_type: Optional[str] = None,
+        part_size: int = 10 * 1024 * 1024,
+    ) -> str:
+        """파일류 객체를 멀티파트로 직접 업로드 (디스크 왕복 없음)
+
+        length=-1이면 MinIO SDK가 part_size 단위로 스트리밍하므로 피크
+        메모리가 파일 크기가 아니라 파트 크기에 비례한다.
+        """
+        def _put() -> None:
+            self.client.put_object(
+                self.bucket,
+                object_name,
+                stream,
+                length=-1,
+                part_size=part_size,
+                content_type=content_type or "application/octet-stream",
+            )
+
+        await asyncio.get_running_loop().run_in_executor(self._io_pool, _put)
+        return f"minio://{self.bucket}/{object_name}"
+
+    async def download_file(self, object_name: str, file_path: str) -> str:
+        await asyncio.get_running_loop().run_in_executor(
+            self._io_pool,
+            self.client.fget_object, self.bucket, object_name, file_path,
+        )
+        return file_path
+
+    async def delete_file(self, object_name: str) -> bool:
+        try:
+            await asyncio.to_thread(
+                self.client.remove_object, self.bucket, object_name
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Delete failed for {object_name}: {e}")
+            return False
+
+    def iter_files(self, prefix: Optional[str] = None) -> Iterator[str]:
+        """오브젝트 이름 이터레이터 (블로킹 — 워커/스크립트용)
+
+        list_objects는 내부적으로 페이지 단위 lazy 조회라, 그대로 흘려
+        보내면 수백만 오브젝트 버킷에서도 메모리가 페이지 하나 수준이다.
+        """
+        yield from (
+            obj.object_name
+            for obj in self.client.list_objects(
+                self.bucket, prefix=prefix, recursive=True
+            )
+        )
+
+    async def aiter_files(
+        self, prefix: Optional[str] = None, page_size: int = 1000
+    ) -> AsyncIterator[str]:
+        """오브젝트 이름 비동기 이터레이터
+
+        블로킹 listing을 page_size개씩 스레드 풀에서 끊어 가져오므로
+        이벤트 루프는 페이지당 잠깐씩만 기다린다.
+        """
+        objects = self.client.list_objects(
+            self.bucket, prefix=prefix, recursive=True
+        )
+
+        def _next_page() -> List[str]:
+            return [
+                obj.object_name
+                for obj in itertools.islice(objects, page_size)
+            ]
+
+        while True:
+            page = await asyncio.to_thread(_next_page)
+            if not page:
+                return
+            for name in page:
+                yield name
+
+    async def list_files(
+        self, prefix: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[str]:
+        """오브젝트 이름 목록 (limit으로 조기 중단 가능)"""
+        def _list() -> List[str]:
+            names = []
+            for obj in self.client.list_objects(
+                self.bucket, prefix=prefix, recursive=True
+            ):
+                names.append(obj.object_name)
+                if limit is not None and len(names) >= limit:
+                    break
+            return names
+
+        return await asyncio.to_thread(_list)
+
+    async def get_presigned_url(
+        self, object_name: str, expires: int = 3600
+    ) -> str:
+        """presigned GET URL (TTL 인지 LRU 캐시)
+
+        SigV4 서명은 호출마다 HMAC-SHA256 파생을 전부 다시 하는 CPU
+        작업이다. 첨부 렌더링처럼 같은 오브젝트를 짧은 간격으로 반복
+        조회하는 패턴에서는 만료까지 60초 이상 남은 URL을 재사용한다.
+        """
+        key = (object_name, expires)
+        now = time.monotonic()
+        cached = self._url_cache.get(key)
+        if cached is not None and cached[1] > now:
+            self._url_cache.move_to_end(key)
+            return cached[0]
+
+        url = await asyncio.to_thread(
+            self.client.presigned_get_object,
+            self.bucket, object_name, expires=timedelta(seconds=expires),
+        )
+        self._url_cache[key] = (url, now + expires - self.URL_CACHE_SLACK)
+        self._url_cache.move_to_end(key)
+        while len(self._url_cache) > self.URL_CACHE_MAX:
+            self._url_cache.popitem(last=False)
+        return url
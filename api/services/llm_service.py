@@ -0,0 +1,411 @@
+"""Ollama LLM 서비스
+
+생성/임베딩/이미지 분석 요청을 여러 Ollama 엔드포인트에 최소 부하
+(진행 중 요청 수 + 지연 EWMA) 기준으로 분산한다. 최근 실패한
+엔드포인트는 쿨다운 동안 제외된다.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional
+
+import aiofiles
+import ollama
+import orjson
+import xxhash
+
+from config import settings
+from utils.text_processing import clean_text, estimate_tokens, smart_chunk
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_json(response: str) -> str:
+    """LLM 응답에서 첫 번째 균형 잡힌 JSON 객체만 잘라낸다
+
+    모델은 "Here is the JSON: {...} Hope this helps!"처럼 산문을 곁들이기
+    일쑤다. 전체 파싱이 실패하면 기본값으로 빠지고 재시도는 LLM 왕복을
+    통째로 다시 무는 셈이라, 중괄호 깊이를 세서 객체 부분만 건진다.
+    """
+    start = response.find('{')
+    if start < 0:
+        return response
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(response)):
+        ch = response[i]
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == '"':
+            in_string = not in_string
+        elif not in_string:
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return response[start:i + 1]
+    return response[start:]
+
+
+def _parse_json_response(response: str, default: Dict) -> Dict:
+    """LLM JSON 응답 파싱 — 빠른 경로 우선
+
+    응답이 이미 순수 JSON이면(지시를 잘 따른 대다수 케이스) 문자 스캔
+    없이 바로 파싱하고, 산문이 섞였을 때만 균형 추출을 거친다.
+    """
+    try:
+        return orjson.loads(response)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return orjson.loads(_extract_json(response))
+    except (ValueError, TypeError):
+        return default
+
+
+class LLMService:
+    """Ollama 기반 LLM 서비스"""
+
+    MAX_RETRIES = 3
+    # embed_batch 미니배치 크기 / 동시 실행 상한
+    EMBED_BATCH_SIZE = 32
+    EMBED_CONCURRENCY = 5
+    # 모델 상주 유지: 호출마다 서버에 전달하는 keep_alive와 핑 주기.
+    # 부하 분산 탓에 한 엔드포인트의 요청 간격은 길게 벌어질 수 있어,
+    # 기본 5분 유휴 언로드에 걸리면 재적재 수 초를 요청이 문다
+    KEEP_ALIVE = "30m"
+    KEEPALIVE_INTERVAL = 30.0
+    # 엔드포인트 지연 EWMA 평활 계수
+    EWMA_ALPHA = 0.2
+    # 실패한 엔드포인트를 후보에서 제외하는 시간
+    ENDPOINT_COOLDOWN = 30.0
+    # 프로세스 내 임베딩 LRU 상한 — 768차원 float 리스트 기준 수십 MB
+    EMB_CACHE_MAX = 10_000
+
+    # 프롬프트 템플릿 — 호출마다 f-string 리터럴 결합을 다시 하지 않도록
+    # 클래스에 한 번만 만들어 둔다 (수천 청크 인제스트에서 의미 있는 양)
+    _SUMMARIZE_TMPL = (
+        "Summarize the following text in approximately "
+        "{max_length} characters:\n\n{text}\n\nSummary:"
+    )
+    _SECTION_TMPL = (
+        "Summarize this text section ({index}/{total}):\n\n"
+        "{content}\n\nSummary:"
+    )
+    _COMBINE_TMPL = (
+        "Combine these section summaries into a single summary of "
+        "approximately {max_length} characters:\n\n{summaries}\n\nSummary:"
+    )
+    _ENTITIES_TMPL = (
+        "Extract entities from the text below and answer with JSON only "
+        '({{"persons": [], "organizations": [], "dates": [], '
+        '"emails": []}}):\n\n{text}\n\nJSON:'
+    )
+    _INTENT_TMPL = (
+        "Classify the intent of this query and answer with JSON only "
+        '({{"intent": "...", "confidence": 0.0}}):\n\n{query}\n\nJSON:'
+    )
+
+    def __init__(self):
+        self.ollama_endpoints = settings.ollama_endpoint_list
+        self.model_name = settings.llm_model
+        self.embedding_model = settings.embedding_model
+        self.vision_model = settings.vision_model
+        self.max_prompt_tokens = 2000
+        self._max_prompt_chars = self.max_prompt_tokens * 4
+        # 최소 부하 선택용 상태 (이벤트 루프 단일 스레드라 락 불필요)
+        self._inflight = {ep: 0 for ep in self.ollama_endpoints}
+        self._latency_ewma = {ep: 0.0 for ep in self.ollama_endpoints}
+        self._cooldown_until = {ep: 0.0 for ep in self.ollama_endpoints}
+        # 동일 텍스트 재임베딩 방지용 프로세스 내 LRU (키: xxh3 해시)
+        self._emb_cache: "OrderedDict[int, List[float]]" = OrderedDict()
+        # 엔드포인트당 AsyncClient 1개 재사용 — 호출마다 클라이언트를
+        # 새로 만들면 매번 TCP 핸드셰이크를 다시 하고 keep-alive 풀도
+        # 버린다. 짧은 왕복 위주 워크로드에서 체감 2-3x 차이
+        self._aclients = {
+            ep: ollama.AsyncClient(host=ep, timeout=120)
+            for ep in self.ollama_endpoints
+        }
+
+    def _pick_endpoint(self) -> str:
+        """최소 부하 엔드포인트 선택
+
+        라운드로빈은 모델을 재적재 중이거나 느린 엔드포인트에도 1/K를
+        계속 보낸다. 진행 중 요청 수가 가장 적은 곳을 고르고, 동률이면
+        최근 지연 EWMA가 낮은 쪽을 택한다. 최근 실패한 엔드포인트는
+        쿨다운 동안 후보에서 뺀다.
+        """
+        now = time.monotonic()
+        eligible = [
+            ep for ep in self.ollama_endpoints
+            if self._cooldown_until[ep] <= now
+        ]
+        if not eligible:
+            # 전부 쿨다운이면 그래도 시도는 한다
+            eligible = self.ollama_endpoints
+        return min(
+            eligible,
+            key=lambda ep: (self._inflight[ep], self._latency_ewma[ep]),
+        )
+
+    def _record_latency(self, endpoint: str, elapsed: float) -> None:
+        prev = self._latency_ewma[endpoint]
+        self._latency_ewma[endpoint] = (
+            elapsed if prev == 0.0
+            else prev + self.EWMA_ALPHA * (elapsed - prev)
+        )
+
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        format: Optional[str] = None,
+    ) -> str:
+        """텍스트 생성 (엔드포인트 장애 시 재시도)
+
+        format="json"이면 Ollama가 문법 제약 샘플링으로 유효한 JSON만
+        내놓는다 — 구조화 응답 경로에서 산문 섞임으로 인한 파싱 실패와
+        그에 따른 재호출이 사라진다.
+        """
+        model = model or self.model_name
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.MAX_RETRIES):
+            endpoint = self._pick_endpoint()
+            self._inflight[endpoint] += 1
+            start = time.monotonic()
+            try:
+                # 동기 Client는 LLM 왕복 내내 이벤트 루프를 막는다 —
+                # AsyncClient로 다른 요청과 동시 진행
+                response = await self._aclients[endpoint].generate(
+                    model=model, prompt=prompt, format=format,
+                    keep_alive=self.KEEP_ALIVE,
+                )
+                self._record_latency(endpoint, time.monotonic() - start)
+                return response['response']
+            except Exception as e:
+                last_error = e
+                self._cooldown_until[endpoint] = (
+                    time.monotonic() + self.ENDPOINT_COOLDOWN
+                )
+                logger.warning(
+                    f"Generate failed on {endpoint} "
+                    f"(attempt {attempt + 1}/{self.MAX_RETRIES}): {e}"
+                )
+            finally:
+                self._inflight[endpoint] -= 1
+            # 지수 백오프 + full jitter — 선형 고정 간격은 동시에 실패한
+            # 호출들의 재시도를 동기화시켜 복구 중인 서버를 다시 때린다.
+            # 마지막 시도 뒤에는 재시도가 없으니 자지 않고 바로 예외로 간다
+            if attempt < self.MAX_RETRIES - 1:
+                await asyncio.sleep(
+                    min(8.0, 0.2 * 2 ** attempt) * (0.5 + random.random())
+                )
+
+        raise RuntimeError(f"All Ollama endpoints failed: {last_error}")
+
+    async def _ping_endpoint(self, endpoint: str) -> None:
+        try:
+            await self._aclients[endpoint].generate(
+                model=self.model_name,
+                prompt=" ",
+                options={"num_predict": 1},
+                keep_alive=self.KEEP_ALIVE,
+            )
+        except Exception as e:
+            logger.warning(f"Model keepalive ping failed for {endpoint}: {e}")
+
+    async def keepalive_loop(self) -> None:
+        """모델 상주 유지 루프 (lifespan에서 태스크로 기동)
+
+        30초마다 모든 엔드포인트에 1토큰 생성 핑을 보내 유휴 언로드를
+        막는다. 트래픽이 한산할 때 첫 요청이 모델 재적재 수 초를 무는
+        일을 없앤다.
+        """
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL)
+            await asyncio.gather(
+                *(self._ping_endpoint(ep) for ep in self.ollama_endpoints)
+            )
+
+    async def embed_text(self, text: str) -> List[float]:
+        """단일 텍스트 임베딩 (프로세스 내 LRU 캐시)
+
+        헤더/보일러플레이트처럼 같은 문자열이 반복 임베딩되는 경로에서
+        Ollama 왕복을 통째로 건너뛴다. 키는 xxh3 해시라 원문을 쥐고
+        있지 않는다.
+        """
+        cache_key = xxhash.xxh3_128_intdigest(text)
+        cached = self._emb_cache.get(cache_key)
+        if cached is not None:
+            self._emb_cache.move_to_end(cache_key)
+            return cached
+
+        endpoint = self._pick_endpoint()
+        self._inflight[endpoint] += 1
+        start = time.monotonic()
+        try:
+            response = await self._aclients[endpoint].embeddings(
+                model=self.embedding_model, prompt=text,
+                keep_alive=self.KEEP_ALIVE,
+            )
+            self._record_latency(endpoint, time.monotonic() - start)
+        finally:
+            self._inflight[endpoint] -= 1
+
+        embedding = response['embedding']
+        self._emb_cache[cache_key] = embedding
+        self._emb_cache.move_to_end(cache_key)
+        while len(self._emb_cache) > self.EMB_CACHE_MAX:
+            self._emb_cache.popitem(last=False)
+        return embedding
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 목록 임베딩 (미니배치 동시 실행)
+
+        항목별 직렬 await(N회 왕복의 합) 대신 길이순으로 묶은 32개
+        미니배치를 세마포어 한도 안에서 동시에 보낸다 — embed_text의
+        최소 부하 선택이 배치를 엔드포인트들에 자연히 흩뿌린다. 결과는
+        원래 순서로 복원해 반환.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sem = asyncio.Semaphore(self.EMBED_CONCURRENCY)
+
+        async def _embed_window(idxs: List[int]) -> List[List[float]]:
+            async with sem:
+                return await asyncio.gather(
+                    *(self.embed_text(texts[i]) for i in idxs)
+                )
+
+        windows = [
+            order[j:j + self.EMBED_BATCH_SIZE]
+            for j in range(0, len(order), self.EMBED_BATCH_SIZE)
+        ]
+        window_results = await asyncio.gather(
+            *(_embed_window(w) for w in windows)
+        )
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for window, results in zip(windows, window_results):
+            for i, embedding in zip(window, results):
+                embeddings[i] = embedding
+        return embeddings
+
+    async def analyze_image(self, image_path: str, prompt: str = "") -> str:
+        """이미지 내용 분석 (vision 모델)"""
+        # 블로킹 read()는 수 MB 이미지 동안 이벤트 루프를 세운다 —
+        # aiofiles로 스레드 풀에서 읽는다
+        async with aiofiles.open(image_path, 'rb') as f:
+            image_data = await f.read()
+
+        endpoint = self._pick_endpoint()
+        self._inflight[endpoint] += 1
+        start = time.monotonic()
+        try:
+            response = await self._aclients[endpoint].generate(
+                model=self.vision_model,
+                prompt=prompt or "Describe this image in detail.",
+                images=[image_data],
+                keep_alive=self.KEEP_ALIVE,
+            )
+            self._record_latency(endpoint, time.monotonic() - start)
+            return response['response']
+        finally:
+            self._inflight[endpoint] -= 1
+
+    async def summarize(self, text: str, max_length: int = 500) -> str:
+        """긴 텍스트 요약 (토큰 예산 초과 시 청크별 요약 후 결합)"""
+        # clean_text는 전체 텍스트를 두 번 regex로 훑는 선형 작업 —
+        # 분기 판정과 본 처리에서 각각 다시 하지 않도록 한 번만 계산
+        cleaned_text = clean_text(text)
+        if estimate_tokens(cleaned_text) <= self.max_prompt_tokens:
+            prompt = self._SUMMARIZE_TMPL.format(
+                max_length=max_length, text=cleaned_text
+            )
+            return await self.generate(prompt)
+
+        chunks = smart_chunk(
+            cleaned_text, chunk_size=self._max_prompt_chars, overlap=200
+        )
+
+        # 청크 요약을 순차 await하면 K개 엔드포인트 중 한 번에 하나만
+        # 일한다. 동시 fan-out하면 generate의 최소 부하 선택이 K대에
+        # 자연히 분산한다. 상한은 엔드포인트당 2 — 그 이상 몰아넣으면
+        # Ollama가 모델을 재적재하며 오히려 느려진다.
+        sem = asyncio.Semaphore(len(self.ollama_endpoints) * 2)
+
+        async def _summarize_section(i: int, content: str) -> str:
+            prompt = self._SECTION_TMPL.format(
+                index=i + 1, total=len(chunks), content=content
+            )
+            async with sem:
+                return await self.generate(prompt)
+
+        chunk_summaries = await asyncio.gather(*(
+            _summarize_section(i, chunk_data['content'])
+            for i, chunk_data in enumerate(chunks)
+        ))
+
+        combined_summary = "\n\n".join(chunk_summaries)
+        # 결합 결과가 아직 예산 초과면 그대로 generate에 밀어넣지 않는다 —
+        # 서버 측 잘림으로 뒷부분 섹션이 통째로 증발한다. 재귀 reduce로
+        # 다시 쪼개 요약 트리를 한 단계 더 내려간다
+        if estimate_tokens(combined_summary) > self.max_prompt_tokens:
+            return await self.summarize(combined_summary, max_length)
+
+        final_prompt = self._COMBINE_TMPL.format(
+            max_length=max_length, summaries=combined_summary
+        )
+        return await self.generate(final_prompt)
+
+    async def summarize_stream(
+        self, text: str, max_length: int = 500
+    ) -> AsyncIterator[str]:
+        """요약을 토큰 단위로 스트리밍
+
+        전체 생성이 끝날 때까지 기다리지 않고 첫 토큰부터 내보내므로
+        체감 지연이 time-to-first-token 수준으로 줄어든다.
+        """
+        cleaned_text = clean_text(text)
+        if estimate_tokens(cleaned_text) > self.max_prompt_tokens:
+            cleaned_text = cleaned_text[: self._max_prompt_chars]
+
+        prompt = self._SUMMARIZE_TMPL.format(
+            max_length=max_length, text=cleaned_text
+        )
+
+        endpoint = self._pick_endpoint()
+        self._inflight[endpoint] += 1
+        try:
+            stream = await self._aclients[endpoint].generate(
+                model=self.model_name, prompt=prompt, stream=True,
+                keep_alive=self.KEEP_ALIVE,
+            )
+            async for part in stream:
+                token = part.get('response', '')
+                if token:
+                    yield token
+        finally:
+            self._inflight[endpoint] -= 1
+
+    async def extract_entities(self, text: str) -> Dict:
+        """LLM 기반 엔티티 추출 (JSON 응답)"""
+        response = await self.generate(
+            self._ENTITIES_TMPL.format(text=text), format="json"
+        )
+        return _parse_json_response(response, {})
+
+    async def parse_intent(self, query: str) -> Dict:
+        """LLM 기반 의도 분석 (JSON 응답)"""
+        response = await self.generate(
+            self._INTENT_TMPL.format(query=query), format="json"
+        )
+        return _parse_json_response(
+            response, {"intent": "search", "confidence": 0.0}
+        )
@@ -0,0 +1,323 @@
+"""Milvus 벡터 저장소 서비스"""
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from pymilvus import (
+    Collection,
+    CollectionSchema,
+    DataType,
+    FieldSchema,
+    utility,
+)
+
+from config import settings
+from dependencies import get_milvus_alias
+
+logger = logging.getLogger(__name__)
+
+# 컬렉션 이름 ↔ 검색 타입 매핑
+_COLLECTIONS = {
+    "text": ("text_embeddings", settings.text_embedding_dim),
+    "image": ("image_embeddings", settings.image_embedding_dim),
+    "document": ("document_embeddings", settings.text_embedding_dim),
+}
+
+
+class VectorStoreService:
+    """Milvus 컬렉션 관리 + 유사도 검색"""
+
+    # 다행 insert 서브배치 크기 / 동시 실행 상한
+    INSERT_SUB_BATCH = 1000
+    INSERT_CONCURRENCY = 4
+    # IVF_FLAT 클러스터 수 기본/상한 — nlist ≈ sqrt(컬렉션 크기)가 정석.
+    # 128 고정은 1M+ 벡터에서 버킷이 비대해져 스캔이 느려진다
+    DEFAULT_NLIST = 128
+    MAX_NLIST = 65536
+
+    def __init__(
+        self,
+        flush_after_insert: bool = False,
+        expected_sizes: Optional[Dict[str, int]] = None,
+        quantization: str = "flat",
+    ):
+        # quantization="sq8"면 새 컬렉션 인덱스를 IVF_SQ8로 만든다 —
+        # 벡터를 인덱스 내에서 8bit로 양자화해 인덱스 크기가 FLAT 대비
+        # ~30%로 줄고, ANN이 메모리 대역폭 바운드라 처리량도 그만큼
+        # 오른다. 일반적인 임베딩 분포에서 리콜 손실은 무시할 수준이지만
+        # 도입 전 컬렉션별로 측정할 것. 소규모(<5만)면 flat 유지 권장.
+        # flush는 세그먼트를 봉인하는 수 초짜리 동기 연산 — 기본은 Milvus
+        # 자동 flush에 맡기고, 삽입 직후 조회 일관성이 꼭 필요한 레거시
+        # 호출자만 옵트인한다
+        self._flush_after_insert = flush_after_insert
+        self._index_type = "IVF_SQ8" if quantization == "sq8" else "IVF_FLAT"
+        self._alias = get_milvus_alias()
+        self._collections: Dict[str, Collection] = {}
+        # load()를 마친 컬렉션 — 질의마다 메타데이터 왕복을 반복하지 않는다
+        self._loaded: set = set()
+        # 컬렉션별 실제 nlist (기존 인덱스에서 읽거나 생성 시 계산)
+        self._nlist: Dict[str, int] = {}
+        for ctype in _COLLECTIONS:
+            self._collections[ctype] = self._ensure_collection(
+                ctype, (expected_sizes or {}).get(ctype)
+            )
+
+    def _ensure_collection(
+        self, collection_type: str, expected_size: Optional[int] = None
+    ) -> Collection:
+        name, dim = _COLLECTIONS[collection_type]
+        if utility.has_collection(name, using=self._alias):
+            collection = Collection(name, using=self._alias)
+            # 기존 인덱스의 nlist를 읽어 nprobe 기본값 계산에 쓴다
+            try:
+                index_params = collection.index().params
+                self._nlist[collection_type] = int(
+                    index_params["params"]["nlist"]
+                )
+            except Exception:
+                self._nlist[collection_type] = self.DEFAULT_NLIST
+        else:
+            schema = CollectionSchema([
+                FieldSchema(
+                    "id", DataType.VARCHAR, is_primary=True, max_length=128
+                ),
+                FieldSchema("content", DataType.VARCHAR, max_length=65535),
+                FieldSchema("embedding", DataType.FLOAT_VECTOR, dim=dim),
+                FieldSchema("metadata", DataType.JSON),
+            ])
+            nlist = self.DEFAULT_NLIST
+            if expected_size:
+                nlist = min(
+                    self.MAX_NLIST,
+                    max(self.DEFAULT_NLIST, int(math.sqrt(expected_size))),
+                )
+            collection = Collection(name, schema, using=self._alias)
+            collection.create_index(
+                "embedding",
+                {
+                    "index_type": self._index_type,
+                    "metric_type": "COSINE",
+                    "params": {"nlist": nlist},
+                },
+            )
+            self._nlist[collection_type] = nlist
+        # 기동 시 미리 적재해 첫 질의가 세그먼트 로딩을 물지 않게 한다
+        try:
+            collection.load()
+            self._loaded.add(collection_type)
+        except Exception as e:
+            logger.warning(f"Collection preload failed for {name}: {e}")
+        return collection
+
+    def _ensure_loaded(self, collection_type: str) -> None:
+        """질의 전 1회 load 보장 — 이후 질의는 체크 한 번이 전부"""
+        if collection_type not in self._loaded:
+            self._collections[collection_type].load()
+            self._loaded.add(collection_type)
+
+    async def insert_text(
+        self,
+        doc_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+    ) -> None:
+        await self._insert_bulk(
+            "text", [doc_id], [content], [embedding], [metadata]
+        )
+
+    async def insert_image(
+        self,
+        doc_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+    ) -> None:
+        await self._insert_bulk(
+            "image", [doc_id], [content], [embedding], [metadata]
+        )
+
+    async def insert_document(
+        self,
+        doc_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Dict[str, Any],
+    ) -> None:
+        await self._insert_bulk(
+            "document", [doc_id], [content], [embedding], [metadata]
+        )
+
+    async def _insert_bulk(
+        self,
+        collection_type: str,
+        ids: List[str],
+        contents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """다행 insert — 서브배치 파이프라인
+
+        초대형 문서는 한 번의 insert로 gRPC 메시지 상한(RESOURCE_EXHAUSTED)을
+        넘을 수 있다. 1000행 서브배치로 쪼개 세마포어 한도 안에서 동시
+        전송하고, flush는 전체 완료 후 1회만 한다.
+        """
+        collection = self._collections[collection_type]
+        # 박싱된 PyFloat 리스트 대신 연속 float32 행렬로 — pymilvus가
+        # proto 직렬화 때 원소별 파이썬 루프 대신 버퍼를 그대로 쓴다.
+        # 임베딩 서비스가 이미 float32 ndarray를 주면 복사도 없다
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        sem = asyncio.Semaphore(self.INSERT_CONCURRENCY)
+
+        async def _insert_sub(lo: int, hi: int) -> None:
+            async with sem:
+                await asyncio.to_thread(
+                    collection.insert,
+                    [
+                        ids[lo:hi],
+                        contents[lo:hi],
+                        embeddings[lo:hi],
+                        metadatas[lo:hi],
+                    ],
+                )
+
+        await asyncio.gather(*(
+            _insert_sub(i, i + self.INSERT_SUB_BATCH)
+            for i in range(0, len(ids), self.INSERT_SUB_BATCH)
+        ))
+        if self._flush_after_insert:
+            await asyncio.to_thread(collection.flush)
+
+    async def flush(self, collection_type: Optional[str] = None) -> None:
+        """수동 flush — 배치 인제스트 끝에 1회 호출
+
+        삽입 직후에는 자동 flush 전까지 조회에 안 잡힐 수 있다(최종
+        일관성). 그 창이 문제가 되는 호출자만 배치 경계에서 부른다.
+        """
+        targets = (
+            [collection_type] if collection_type else list(_COLLECTIONS)
+        )
+        for ctype in targets:
+            await asyncio.to_thread(self._collections[ctype].flush)
+
+    async def insert_text_bulk(self, ids, contents, embeddings, metadatas) -> None:
+        await self._insert_bulk("text", ids, contents, embeddings, metadatas)
+
+    async def insert_image_bulk(self, ids, contents, embeddings, metadatas) -> None:
+        await self._insert_bulk("image", ids, contents, embeddings, metadatas)
+
+    async def insert_document_bulk(self, ids, contents, embeddings, metadatas) -> None:
+        await self._insert_bulk("document", ids, contents, embeddings, metadatas)
+
+    async def search_batch(
+        self,
+        collection_type: str,
+        query_embeddings: List[List[float]],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """다중 질의 배치 검색 — 질의 Q개를 gRPC 1회로
+
+        IVF 인덱스는 배치 질의에서 센트로이드 스캔을 공유하므로 재랭킹·
+        하이브리드 검색처럼 질의가 여러 개인 경로는 개별 호출보다 훨씬
+        싸다. 질의 순서대로 히트 목록을 돌려준다.
+        """
+        collection = self._collections[collection_type]
+        self._ensure_loaded(collection_type)
+
+        expr = None
+        if filters:
+            clauses = [f'metadata["{k}"] == "{v}"' for k, v in filters.items()]
+            expr = " and ".join(clauses)
+
+        # pymilvus는 gRPC 대기 동안 GIL을 놓는다 — 스레드로 내려보내면
+        # 이벤트 루프가 살고, 동시 검색도 실제로 병렬이 된다
+        if search_params is None:
+            # nprobe를 nlist에 비례시켜 리콜-지연 균형을 컬렉션 크기에 맞춘다
+            nprobe = max(8, self._nlist[collection_type] // 32)
+            search_params = {
+                "metric_type": "COSINE",
+                "params": {"nprobe": nprobe},
+            }
+
+        results = await asyncio.to_thread(
+            collection.search,
+            np.asarray(query_embeddings, dtype=np.float32),
+            "embedding",
+            search_params,
+            limit=top_k,
+            expr=expr,
+            output_fields=["content", "metadata"],
+        )
+
+        return [
+            [
+                {
+                    "id": hit.id,
+                    "content": hit.entity.get("content"),
+                    "score": float(hit.score),
+                    "metadata": hit.entity.get("metadata") or {},
+                    "document_type": collection_type,
+                }
+                for hit in result
+            ]
+            for result in results
+        ]
+
+    async def search(
+        self,
+        collection_type: str,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        batches = await self.search_batch(
+            collection_type,
+            [query_embedding],
+            top_k=top_k,
+            filters=filters,
+            search_params=search_params,
+        )
+        return batches[0]
+
+    async def search_all(
+        self, query_embedding: List[float], top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """전체 컬렉션 검색 후 점수순 병합
+
+        세 컬렉션을 순차로 돌면 지연이 ANN 검색 3회의 합 — 동시에 보내
+        max() 수준으로 줄인다.
+        """
+        per_collection = await asyncio.gather(*(
+            self.search(ctype, query_embedding, top_k=top_k)
+            for ctype in _COLLECTIONS
+        ))
+        all_hits: List[Dict[str, Any]] = []
+        for hits in per_collection:
+            all_hits.extend(hits)
+        all_hits.sort(key=lambda h: h["score"], reverse=True)
+        return all_hits[:top_k]
+
+    async def search_similar_to(
+        self, document_id: str, top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """기존 문서의 임베딩으로 유사 문서 검색"""
+        for ctype in ("document", "text"):
+            collection = self._collections[ctype]
+            self._ensure_loaded(ctype)
+            # query도 search처럼 블로킹 gRPC — 스레드로 내려 루프를 살린다
+            rows = await asyncio.to_thread(
+                collection.query,
+                expr=f'id == "{document_id}"',
+                output_fields=["embedding"],
+            )
+            if rows:
+                embedding = rows[0]["embedding"]
+                hits = await self.search(ctype, embedding, top_k=top_k + 1)
+                return [h for h in hits if h["id"] != document_id][:top_k]
+        return []
@@ -0,0 +1,17 @@
+from utils.text_processing import (
+    chunk_text_advanced,
+    clean_text,
+    estimate_tokens,
+    extract_keywords,
+    extract_text_from_file,
+    smart_chunk,
+)
+
+__all__ = [
+    "chunk_text_advanced",
+    "clean_text",
+    "estimate_tokens",
+    "extract_keywords",
+    "extract_text_from_file",
+    "smart_chunk",
+]
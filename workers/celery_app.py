@@ -0,0 +1,30 @@
+"""Celery 앱 정의
+
+워커 컨테이너는 이 디렉터리를 작업 디렉터리로 해서
+`celery -A celery_app worker`로 기동한다 (docker-compose.yml 참고).
+"""
+import os
+
+from celery import Celery
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
+
+app = Celery(
+    "workers",
+    broker=f"{REDIS_URL}/0",
+    backend=f"{REDIS_URL}/1",
+    include=["tasks"],
+)
+
+app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="Asia/Seoul",
+    result_expires=86400,
+    task_routes={
+        "tasks.send_email_task": {"queue": "email"},
+        "tasks.summarize_content_task": {"queue": "summarization"},
+        "tasks.process_document_task": {"queue": "processing"},
+    },
+)
@@ -0,0 +1,87 @@
+"""Celery 태스크 정의
+
+워커 이미지는 api/ 패키지를 포함하지 않으므로(컨테이너 분리)
+텍스트 유틸은 여기 복사본을 사용한다.
+"""
+import logging
+import re
+import smtplib
+import time
+from collections import Counter
+from email.mime.text import MIMEText
+from typing import Dict, List
+
+try:
+    # 워커 컨테이너: 작업 디렉터리가 workers/ 라서 평평한 모듈로 임포트됨
+    from celery_app import app
+except ImportError:
+    # 개발 환경: 저장소 루트에서 패키지로 임포트
+    from workers.celery_app import app
+
+logger = logging.getLogger(__name__)
+
+# api/utils/text_processing.py의 패턴과 동일하게 유지할 것
+_RE_WS = re.compile(r'\s+')
+_RE_SPECIAL = re.compile(r'[^\w\s.,!?;:\'-]')
+
+
+def clean_text(text: str) -> str:
+    """공백 정규화 + 특수문자 제거"""
+    return _RE_SPECIAL.sub('', _RE_WS.sub(' ', text)).strip()
+
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
+    "for", "of", "with", "by", "from", "this", "that", "these",
+    "those", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "will", "would", "could", "should",
+})
+
+
+def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
+    """단어 빈도 기반 키워드 추출"""
+    freq = Counter(
+        w for w in _WORD_RE.findall(text.lower())
+        if len(w) > 3 and w not in _STOP_WORDS
+    )
+    return [w for w, _ in freq.most_common(max_keywords)]
+
+
+@app.task(name="tasks.send_email_task", bind=True, max_retries=3)
+def send_email_task(self, to: str, subject: str, body: str) -> Dict:
+    """이메일 발송 (SMTP 미설정 시 로그로 대체)"""
+    try:
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["To"] = to
+        try:
+            with smtplib.SMTP("localhost", 25, timeout=10) as smtp:
+                smtp.send_message(msg)
+            delivered = True
+        except OSError:
+            logger.info(f"SMTP unavailable, logging email to {to}: {subject}")
+            delivered = False
+        return {"to": to, "subject": subject, "delivered": delivered}
+    except Exception as e:
+        raise self.retry(exc=e, countdown=30)
+
+
+@app.task(name="tasks.summarize_content_task", bind=True, max_retries=2)
+def summarize_content_task(self, content: str, max_length: int = 500) -> Dict:
+    """본문 요약 (추출식 — 워커에는 LLM 클라이언트가 없다)"""
+    cleaned = clean_text(content)
+    keywords = extract_keywords(cleaned, 10)
+    summary = cleaned[:max_length]
+    return {
+        "summary": summary,
+        "keywords": keywords,
+        "original_length": len(content),
+    }
+
+
+@app.task(name="tasks.process_document_task", bind=True, max_retries=2)
+def process_document_task(self, document_id: str, file_url: str) -> Dict:
+    """문서 후처리 (자리표시자 — 실제 파이프라인은 API가 수행)"""
+    time.sleep(0.1)
+    return {"document_id": document_id, "file_url": file_url, "status": "done"}